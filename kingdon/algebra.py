@@ -19,6 +19,7 @@ import numpy as np
 import sympy
 
 from kingdon.codegen import (
+    _bit_count,
     codegen_gp, codegen_sw, codegen_cp, codegen_ip, codegen_op, codegen_div,
     codegen_rp, codegen_acp, codegen_proj, codegen_sp, codegen_lc, codegen_inv,
     codegen_rc, codegen_normsq, codegen_add, codegen_neg, codegen_reverse,
@@ -35,6 +36,25 @@ from kingdon.graph import GraphWidget
 operation_field = partial(field, default_factory=dict, init=False, repr=False, compare=False)
 
 
+def _simp_func_default(v):
+    """
+    Default simplification function applied to every multivector coefficient.
+    Module-level (instead of a lambda) so it can be pickled, e.g. to simplify
+    coefficients in parallel worker processes.
+
+    GA coefficients are typically polynomials in independent symbols, for which
+    :func:`sympy.expand` is enough to canonicalize them and detect structural zeros;
+    the full :func:`sympy.simplify` is orders of magnitude slower and only needed for
+    the occasional non-polynomial coefficient (e.g. trigonometric or rational functions).
+    """
+    if not isinstance(v, sympy.Expr):
+        return v
+    v = sympy.expand(v)
+    if v.is_polynomial():
+        return v
+    return sympy.simplify(v)
+
+
 @dataclass
 class Algebra:
     """
@@ -53,6 +73,14 @@ class Algebra:
     :param basis: Custom basis order, e.g. `["e", "e1", "e2", "e0", "e20", "e01", "e12", "e012"]` for 2DPGA.
     :param cse: If :code:`True` (default), attempt Common Subexpression Elimination (CSE)
         on symbolically optimized expressions.
+    :param codegen_cache_dir: Optional path to a directory in which generated code is persisted
+        between interpreter sessions. When set, operators that were symbolically optimized in a
+        previous session are loaded from disk, skipping the (expensive) symbolic codegen entirely.
+    :param dense_gp: If :code:`True` (default is :code:`False`), geometric products between full
+        numeric multivectors are computed by contracting with the dense Cayley tensor of the
+        algebra instead of through generated code. This skips codegen entirely, which pays off
+        when each product shape occurs only a few times; the result can differ from the generated
+        code in the last floating point digit because the terms are summed in a different order.
     :param graded: If :code:`True` (default is :code:`False`), perform binary and unary operations on a graded basis.
         This will still be more sparse than computing with a full multivector, but not as sparse as possible.
         It does however, vastly reduce the number of possible expressions that have to be symbolically optimized.
@@ -62,6 +90,8 @@ class Algebra:
         printing into a python function slower.
     :param wrapper: A function that is always applied to the generated functions as a decorator. For example,
         using :code:`numba.njit` as a wrapper will ensure that all kingdon code is jitted using numba.
+        For array-valued multivectors (e.g. values of shape :code:`(len(mv), N)`) a parallel wrapper
+        such as :code:`numba.njit(parallel=True)` can be used to spread the rows over multiple threads.
     :param codegen_symbolcls: The symbol class used during codegen. By default, this is our own fast
         :class:`~kingdon.polynomial.RationalPolynomial` class.
     :param simp_func: This function is applied as a filter function to every multivector coefficient.
@@ -120,6 +150,8 @@ class Algebra:
 
     # Options for the algebra
     cse: bool = field(default=True, repr=False)  # Common Subexpression Elimination (CSE)
+    codegen_cache_dir: str = field(default=None, repr=False, compare=False)  # Persist generated code to this dir.
+    dense_gp: bool = field(default=False, repr=False)  # Compute full numeric products with the Cayley tensor.
     graded: bool = field(default=False, repr=False)  # If true, precompute products per grade.
     pretty_blade: str = field(default='𝐞', repr=False, compare=False)
     pretty_digits: dict = field(default_factory=dict, init=False, repr=False, compare=False)  # TODO: this can be defined outside Algebra
@@ -131,11 +163,15 @@ class Algebra:
     # The symbol class used in codegen. By default, use our own fast RationalPolynomial class.
     codegen_symbolcls: object = field(default=None, repr=False, compare=False)
     # This simplify func is applied to every component after a symbolic expression is called, to simplify and filter by.
-    simp_func: Callable = field(default=lambda v: v if not isinstance(v, sympy.Expr) else sympy.simplify(sympy.expand(v)), repr=False, compare=False)
+    simp_func: Callable = field(default=_simp_func_default, repr=False, compare=False)
 
     signs: dict = field(init=False, repr=False, compare=False)
     blades: "BladeDict" = field(init=False, repr=False, compare=False)
     pss: object = field(init=False, repr=False, compare=False)
+    # Memoized tables of non-zero blade products, keyed by the input key-tuples.
+    _product_tables: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Lambdified multivectors, shared between multivectors with identical structure.
+    _callable_cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.signature is not None:
@@ -234,9 +270,15 @@ class Algebra:
     def __len__(self):
         return 2 ** self.d
 
+    @cached_property
+    def _indices_for_grade(self):
+        return DefaultKeyDict(lambda grade: tuple(
+            sum(2**bin for bin in bins) for bins in combinations(range(self.d), r=grade)))
+
     def indices_for_grade(self, grade: int):
         """
-        Function that returns a generator for all the indices for a given grade. E.g. in 2D VGA, this returns
+        Function that returns a tuple of all the indices for a given grade, memoized
+        per algebra. E.g. in 2D VGA, this returns
 
         .. code-block ::
 
@@ -244,12 +286,17 @@ class Algebra:
             >>> tuple(alg.indices_for_grade(1))
             (1, 2)
         """
-        return (sum(2**bin for bin in bins) for bins in combinations(range(self.d), r=grade))
+        return self._indices_for_grade[grade]
+
+    @cached_property
+    def _indices_for_grades(self):
+        return DefaultKeyDict(lambda grades: tuple(chain.from_iterable(
+            self.indices_for_grade(grade) for grade in grades)))
 
     def indices_for_grades(self, grades: Tuple[int]):
         """
-        Function that returns a generator for all the indices from a sequence of grades.
-        E.g. in 2D VGA, this returns
+        Function that returns a tuple of all the indices for a sequence of grades,
+        memoized per algebra. E.g. in 2D VGA, this returns
 
         .. code-block ::
 
@@ -257,7 +304,7 @@ class Algebra:
             >>> tuple(alg.indices_for_grades((1, 2)))
             (1, 2, 3)
         """
-        return (chain.from_iterable(self.indices_for_grade(grade) for grade in sorted(grades)))
+        return self._indices_for_grades[tuple(sorted(grades))]
 
     @cached_property
     def matrix_basis(self):
@@ -310,6 +357,88 @@ class Algebra:
 
         return signs
 
+    @cached_property
+    def signs_arr(self):
+        """
+        Dense :code:`int8` array version of :attr:`signs`. Indexing
+        :code:`signs_arr[I, J]` is a plain array load instead of a tuple hash plus
+        dict lookup, which matters in the sign-heavy codegen loops. :code:`None`
+        for high-dimensional algebras, where :attr:`signs` is a lazily populated
+        :class:`DefaultKeyDict` (and a :code:`(2**d)**2` table would be prohibitive),
+        even when the user overrides :code:`large=False`.
+        """
+        if self.large or self.d > 6:
+            return None
+        arr = np.zeros((len(self), len(self)), dtype=np.int8)
+        for (I, J), sign in self.signs.items():
+            arr[I, J] = sign
+        return arr
+
+    @cached_property
+    def cayley_tensor(self):
+        """
+        Dense :code:`(2**d, 2**d, 2**d)` int8 tensor :code:`T` of the algebra, with
+        :code:`T[I, J, I ^ J] = signs[I, J]`. The geometric product of full numeric
+        multivectors is a single contraction with this tensor, which lets
+        :class:`~kingdon.multivector.MultiVector.gp` skip codegen entirely.
+        :code:`None` for high-dimensional algebras, where :attr:`signs` is lazily
+        populated and could not fill the tensor (and where it would not fit anyway).
+        """
+        if self.large or self.d > 6:
+            return None
+        tensor = np.zeros((len(self),) * 3, dtype=np.int8)
+        for (I, J), sign in self.signs.items():
+            if sign:
+                tensor[I, J, I ^ J] = sign
+        return tensor
+
+    @cached_property
+    def _canonical_keys(self):
+        """ All keys of the algebra, in canonical (grade-sorted) order. """
+        return tuple(self.canon2bin.values())
+
+    @cached_property
+    def _key_positions(self):
+        """ Mapping from key to its position in the canonical order. """
+        return {key: pos for pos, key in enumerate(self._canonical_keys)}
+
+    def product_table(self, keys_x: Tuple[int], keys_y: Tuple[int]):
+        """
+        Table of all non-zero geometric products between the basis blades
+        :code:`keys_x` and :code:`keys_y`, as a tuple of
+        :code:`(i, j, key_x, key_y, key_out, sign)` entries, where :code:`i` and
+        :code:`j` index into the value sequences corresponding to the input keys.
+
+        Since :code:`signs` and the blades are fixed per algebra, the table is
+        memoized so all product-type operators between the same key-tuples share it.
+        For large algebras, where the direct computation path rebuilds products on
+        every call, only small tables are memoized to keep the memory use bounded.
+        """
+        if (table := self._product_tables.get((keys_x, keys_y))) is None:
+            if (signs_arr := self.signs_arr) is not None:
+                # Find the non-zero pairs in one vectorized pass over the sign table.
+                ks_x = np.fromiter(keys_x, dtype=np.intp, count=len(keys_x))
+                ks_y = np.fromiter(keys_y, dtype=np.intp, count=len(keys_y))
+                sub = signs_arr[np.ix_(ks_x, ks_y)]
+                I, J = np.nonzero(sub)
+                kxs, kys = ks_x[I].tolist(), ks_y[J].tolist()
+                table = tuple(zip(
+                    I.tolist(), J.tolist(), kxs, kys,
+                    (kx ^ ky for kx, ky in zip(kxs, kys)),
+                    sub[I, J].tolist(),
+                ))
+            else:
+                signs = self.signs
+                table = tuple(
+                    (i, j, kx, ky, kx ^ ky, sign)
+                    for i, kx in enumerate(keys_x)
+                    for j, ky in enumerate(keys_y)
+                    if (sign := signs[kx, ky])
+                )
+            if not self.large or len(keys_x) * len(keys_y) <= 4096:
+                self._product_tables[keys_x, keys_y] = table
+        return table
+
     @cached_property
     def cayley(self):
         """ Cayley table of the algebra. """
@@ -603,7 +732,7 @@ class BladeDict(Mapping):
         if basis_blade not in self.blades:
             bin_blade = self.algebra.canon2bin[basis_blade]
             if self.algebra.graded:
-                g = format(bin_blade, 'b').count('1')
+                g = _bit_count(bin_blade)
                 indices = self.algebra.indices_for_grade(g)
                 self.blades[basis_blade] = self.algebra.multivector(values=[int(bin_blade == i) for i in indices], grades=(g,))
             else:
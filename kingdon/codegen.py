@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import string
+import sys
 from itertools import product, combinations, groupby
 from collections import namedtuple, defaultdict
 from typing import NamedTuple, Callable, Tuple, Dict
@@ -13,8 +14,20 @@ import inspect
 import builtins
 import keyword
 
+from sympy import Expr
 from sympy.utilities.iterables import iterable, flatten
 from sympy.printing.lambdarepr import LambdaPrinter
+from sympy.printing.precedence import PRECEDENCE
+
+if sys.version_info >= (3, 10):
+    _bit_count = int.bit_count
+else:
+    def _bit_count(n):
+        count = 0
+        while n:
+            n &= n - 1
+            count += 1
+        return count
 
 
 @dataclass
@@ -74,6 +87,22 @@ def power_supply(x: "MultiVector", exponents: Tuple[int, ...], operation: Callab
         yield powers[step]
 
 
+def _signs_table(algebra):
+    """ Prefer the dense int8 sign array over the sign dict when the algebra has one. """
+    return algebra.signs if (arr := algebra.signs_arr) is None else arr
+
+
+def _nonzero_terms(res: dict) -> dict:
+    """
+    Drop the symbolically zero terms from a dict of accumulated coefficients.
+    Truthiness of a sympy expression is structural and misses cancellations that
+    were not auto-collected, so those get an exact :code:`expand() == 0` test;
+    never the ambiguous truth-value protocol of a symbolic comparison.
+    """
+    return {k: v for k, v in res.items()
+            if (v.expand() != 0 if isinstance(v, Expr) else v)}
+
+
 class CodegenOutput(NamedTuple):
     """
     Output of a codegen function.
@@ -98,9 +127,26 @@ def codegen_product(x, y, filter_func=None, sign_func=None, keyout_func=operator
         for metric dependent products. Input: 2-tuple of blade indices, e.g. (ei, ej).
     :param keyout_func:
     """
-    sign_func = sign_func or (lambda pair: x.algebra.signs[pair])
-
     res = {}
+    if sign_func is None and keyout_func is operator.xor:
+        # Metric products with the default sign and key: use the memoized product
+        # table of the algebra, which already has all zero-sign pairs removed.
+        # Since filter_func only depends on the keys, apply it before touching values.
+        pairs = x.algebra.product_table(tuple(x.keys()), tuple(y.keys()))
+        if filter_func:
+            pairs = [pair for pair in pairs if filter_func(pair[2], pair[3], pair[4])]
+        vals_x, vals_y = x.values(), y.values()
+        for i, j, kx, ky, key_out, sign in pairs:
+            termstr = vals_x[i] * vals_y[j] if sign > 0 else (- vals_x[i] * vals_y[j])
+            if key_out in res:
+                res[key_out] += termstr
+            else:
+                res[key_out] = termstr
+        return res
+
+    signs = _signs_table(x.algebra)
+    sign_func = sign_func or (lambda pair: signs[pair])
+
     for (kx, vx), (ky, vy) in product(x.items(), y.items()):
         if (sign := sign_func((kx, ky))):
             key_out = keyout_func(kx, ky)
@@ -125,12 +171,46 @@ def codegen_gp(x, y):
     return codegen_product(x, y)
 
 
+def _codegen_fused_triple(x, y, z, filter_func=None):
+    r"""
+    Accumulate the trilinear polynomial :math:`x y \widetilde{z}` in a single pass,
+    instead of materializing the intermediate :math:`x y` multivector and running
+    two separate products.
+
+    :param filter_func: optional filter applied to the first product, with the same
+        signature as in :func:`codegen_product`.
+    """
+    signs = _signs_table(x.algebra)
+    res = {}
+    for (kx, vx), (ky, vy) in product(x.items(), y.items()):
+        if not (sign_xy := signs[kx, ky]):
+            continue
+        kxy = kx ^ ky
+        if filter_func and not filter_func(kx, ky, kxy):
+            continue
+        vxy = vx * vy
+        for kz, vz in z.items():
+            if not (sign := sign_xy * signs[kxy, kz]):
+                continue
+            if (_bit_count(kz) >> 1) & 1:  # Reversion of z.
+                sign = -sign
+            key_out = kxy ^ kz
+            term = vxy * vz if sign > 0 else -(vxy * vz)
+            if key_out in res:
+                res[key_out] += term
+            else:
+                res[key_out] = term
+    return _nonzero_terms(res)
+
+
 def codegen_sw(x, y):
     r"""
     Generate the conjugation of :code:`y` by :code:`x`: :math:`x y \widetilde{x}`.
 
     :return: tuple of keys in binary representation and a lambda function.
     """
+    if getattr(x, 'issymbolic', False) and getattr(y, 'issymbolic', False):
+        return _codegen_fused_triple(x, y, x)
     return x * y * ~x
 
 
@@ -140,8 +220,8 @@ def codegen_cp(x, y):
 
     :return: tuple of keys in binary representation and a lambda function.
     """
-    algebra = x.algebra
-    filter_func = lambda kx, ky, k_out: (algebra.signs[kx, ky] - algebra.signs[ky, kx])
+    signs = _signs_table(x.algebra)
+    filter_func = lambda kx, ky, k_out: (signs[kx, ky] - signs[ky, kx])
     return codegen_product(x, y, filter_func=filter_func)
 
 
@@ -151,8 +231,8 @@ def codegen_acp(x, y):
 
     :return: tuple of keys in binary representation and a lambda function.
     """
-    algebra = x.algebra
-    filter_func = lambda kx, ky, k_out: (algebra.signs[kx, ky] + algebra.signs[ky, kx])
+    signs = _signs_table(x.algebra)
+    filter_func = lambda kx, ky, k_out: (signs[kx, ky] + signs[ky, kx])
     return codegen_product(x, y, filter_func=filter_func)
 
 
@@ -202,6 +282,8 @@ def codegen_proj(x, y):
 
     :return: tuple of keys in binary representation and a lambda function.
     """
+    if getattr(x, 'issymbolic', False) and getattr(y, 'issymbolic', False):
+        return _codegen_fused_triple(x, y, y, filter_func=lambda kx, ky, k_out: k_out == abs(kx - ky))
     return (x | y) * ~y
 
 
@@ -232,11 +314,12 @@ def codegen_rp(x, y):
     keyout_func = lambda kx, ky: key_pss - (kx ^ ky)
     filter_func = lambda kx, ky, k_out: key_pss == kx + ky - k_out
     # Sign is composed of dualization of each blade, exterior product, and undual.
+    signs = _signs_table(algebra)
     sign_func = lambda pair: (
-        algebra.signs[pair[0], key_pss - pair[0]] *
-        algebra.signs[pair[1], key_pss - pair[1]] *
-        algebra.signs[key_pss - pair[0], key_pss - pair[1]] *
-        algebra.signs[key_pss - (pair[0] ^ pair[1]), pair[0] ^ pair[1]]
+        signs[pair[0], key_pss - pair[0]] *
+        signs[pair[1], key_pss - pair[1]] *
+        signs[key_pss - pair[0], key_pss - pair[1]] *
+        signs[key_pss - (pair[0] ^ pair[1]), pair[0] ^ pair[1]]
     )
 
     return codegen_product(
@@ -263,7 +346,16 @@ class LambdifyInput(NamedTuple):
 
 def codegen_inv(y, symbolic=False):
     alg = y.algebra
-    if alg.d < 6:
+    if len(y.keys()) == 1 or y.grades == (1,):
+        # Single basis blades and vectors square to a scalar, so they invert
+        # directly without the Hitzer/Shirokov machinery.
+        num = ~y
+        denom = y.sp(num)
+        if not denom:
+            # Structurally null, e.g. e0 in PGA. The closed-form paths produce a
+            # symbolically zero numerator for those, so match that and return 0.
+            num = num.fromkeysvalues(alg, tuple(), [])
+    elif alg.d < 6:
         num, denom = codegen_hitzer_inv(y, symbolic=True)
     else:
         num, denom = codegen_shirokov_inv(y, symbolic=True)
@@ -357,6 +449,21 @@ def codegen_div(x, y):
 
 
 def codegen_normsq(x):
+    if getattr(x, 'issymbolic', False):
+        signs = _signs_table(x.algebra)
+        res = {}
+        for (kx, vx), (kz, vz) in product(x.items(), x.items()):
+            if not (sign := signs[kx, kz]):
+                continue
+            if (_bit_count(kz) >> 1) & 1:  # Reversion of the right x.
+                sign = -sign
+            key_out = kx ^ kz
+            term = vx * vz if sign > 0 else -(vx * vz)
+            if key_out in res:
+                res[key_out] += term
+            else:
+                res[key_out] = term
+        return _nonzero_terms(res)
     return x * ~x
 
 
@@ -404,6 +511,9 @@ def codegen_outertan(x):
 
 
 def codegen_add(x, y):
+    if x.keys() == y.keys():
+        # Common case: identical structure, so no dict merge is needed.
+        return {k: vx + vy for k, vx, vy in zip(x.keys(), x.values(), y.values())}
     vals = dict(x.items())
     for k, v in y.items():
         if k in vals:
@@ -414,6 +524,8 @@ def codegen_add(x, y):
 
 
 def codegen_sub(x, y):
+    if x.keys() == y.keys():
+        return {k: vx - vy for k, vx, vy in zip(x.keys(), x.values(), y.values())}
     vals = dict(x.items())
     for k, v in y.items():
         if k in vals:
@@ -433,7 +545,10 @@ def codegen_involutions(x, invert_grades=(2, 3)):
 
     :param invert_grades: The grades that flip sign under this involution mod 4, e.g. (2, 3) for reversion.
     """
-    return {k: -v if bin(k).count('1') % 4 in invert_grades else v
+    # Encode the inverted grades (mod 4) as a bitmask, so the sign test is pure
+    # bit arithmetic instead of a tuple membership test.
+    invert_mask = sum(1 << grade for grade in invert_grades)
+    return {k: -v if (invert_mask >> (_bit_count(k) & 3)) & 1 else v
             for k, v in x.items()}
 
 
@@ -501,13 +616,26 @@ def codegen_unhodge(x):
 
 
 def _lambdify_mv(mv):
+    # Multivectors with identical keys, symbols and expressions compile to the same
+    # function, so share those on the algebra instead of lambdifying per instance.
+    symbols = sorted(mv.free_symbols, key=lambda x: x.name)
+    cache_key = (tuple(s.name for s in symbols), tuple(mv.keys()), tuple(mv.values()))
+    try:
+        if (cached := mv.algebra._callable_cache.get(cache_key)) is not None:
+            return cached
+    except TypeError:  # Unhashable values, e.g. arrays.
+        cache_key = None
+
     func = lambdify(
-        args={'x': sorted(mv.free_symbols, key=lambda x: x.name)},
+        args={'x': symbols},
         exprs=list(mv.values()),
         funcname=f'custom_{mv.type_number}',
         cse=mv.algebra.cse
     )
-    return CodegenOutput(tuple(mv.keys()), func)
+    res = CodegenOutput(tuple(mv.keys()), func)
+    if cache_key is not None:
+        mv.algebra._callable_cache[cache_key] = res
+    return res
 
 
 def do_codegen(codegen, *mvs) -> CodegenOutput:
@@ -649,7 +777,7 @@ def lambdify(args: dict, exprs: list, funcname: str, dependencies: tuple = None,
     :return: Function that represents that can be used to calculate the values of exprs.
     """
     if printer is LambdaPrinter:
-        printer = LambdaPrinter(
+        printer = _UnrolledPowPrinter(
             {'fully_qualified_modules': False, 'inline': True,
              'allow_unknown_functions': True,
              'user_functions': {}}
@@ -685,6 +813,18 @@ def lambdify(args: dict, exprs: list, funcname: str, dependencies: tuple = None,
         _exprs = list('0' for expr in _exprs)
     funcstr = funcprinter.doprint(funcname, iterable_args, names, _exprs, cses=cses)
 
+    return compile_funcstr(funcstr, funcname)
+
+
+def compile_funcstr(funcstr: str, funcname: str) -> Callable:
+    """
+    Compile the source string of a generated function into a callable,
+    and register the source with :mod:`linecache` so it remains inspect-safe.
+
+    :param funcstr: Source code of the function, as produced by e.g. :func:`lambdify`.
+    :param funcname: Name of the function in :code:`funcstr`.
+    :return: the compiled function.
+    """
     # Provide lambda expression with builtins, and compatible implementation of range
     namespace = {'builtins': builtins, 'range': range}
 
@@ -695,8 +835,33 @@ def lambdify(args: dict, exprs: list, funcname: str, dependencies: tuple = None,
     # mtime has to be None or else linecache.checkcache will remove it
     linecache.cache[filename] = (len(funcstr), None, funcstr.splitlines(True), filename) # type: ignore
 
-    func = funclocals[funcname]
-    return func
+    return funclocals[funcname]
+
+
+def func_source(func: Callable) -> str:
+    """
+    Retrieve the source of a generated function from :mod:`linecache`.
+    Returns an empty string if the source is not available.
+    """
+    entry = linecache.cache.get(func.__code__.co_filename)
+    return ''.join(entry[2]) if entry else ''
+
+
+class _UnrolledPowPrinter(LambdaPrinter):
+    """
+    :class:`LambdaPrinter` that prints small positive integer powers as repeated
+    multiplication, e.g. :code:`x**3` as :code:`x*x*x`. Integer powers in the
+    generated functions otherwise go through CPython's (float) pow machinery,
+    which is considerably slower than a chain of multiplications.
+    """
+    def _print_Pow(self, expr, **kwargs):
+        if expr.exp.is_Integer and 2 <= expr.exp <= 6:
+            base = self.parenthesize(expr.base, PRECEDENCE['Pow'])
+            # Parenthesize the chain itself: the caller assumes this node binds
+            # at Pow precedence, but a bare chain only binds at Mul precedence
+            # (e.g. in a denominator it would print as .../y*y).
+            return '(' + '*'.join([base] * int(expr.exp)) + ')'
+        return super()._print_Pow(expr, **kwargs)
 
 
 class KingdonPrinter:
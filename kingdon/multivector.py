@@ -9,21 +9,12 @@ import re
 import math
 import sys
 
+import numpy as np
 from sympy import Expr, Symbol, sympify, sinc, cos
 
-from kingdon.codegen import _lambdify_mv
+from kingdon.codegen import _lambdify_mv, _bit_count
 from kingdon.polynomial import RationalPolynomial
 
-if sys.version_info >= (3, 10):
-    _bit_count = int.bit_count
-else:
-    def _bit_count(n):
-        count = 0
-        while n:
-            n &= n - 1
-            count += 1
-        return count
-
 
 @dataclass(init=False)
 class MultiVector:
@@ -82,7 +73,7 @@ class MultiVector:
                 raise ValueError(f'Each grade in `grades` needs to be a value between 0 and {algebra.d}.')
         else:
             if keys:
-                grades = tuple(sorted({format(k, 'b').count('1') for k in keys}))
+                grades = tuple(sorted({_bit_count(k) for k in keys}))
             else:
                 grades = tuple(range(algebra.d + 1))
 
@@ -95,10 +86,10 @@ class MultiVector:
             keys, values = zip(*values.items()) if values else (tuple(), list())
             values = list(values)
         elif len(values) == sum(math.comb(algebra.d, grade) for grade in grades) and not keys:
-            keys = tuple(algebra.indices_for_grades(grades))
+            keys = algebra.indices_for_grades(grades)
         elif name and not values:
             # values was not given, but we do have a name. So we are in symbolic mode.
-            keys = tuple(algebra.indices_for_grades(grades)) if not keys else keys
+            keys = algebra.indices_for_grades(grades) if not keys else keys
             values = list(symbolcls(f'{name}{algebra.bin2canon[k][1:]}') for k in keys)
         elif len(keys) != len(values):
             raise TypeError(f'Length of `keys` and `values` have to match.')
@@ -111,20 +102,34 @@ class MultiVector:
             values = list(val if not isinstance(val, str) else sympify(val)
                           for val in values)
 
-        if not all(_bit_count(k) in grades for k in keys):
+        if (isinstance(values, (list, tuple)) and len(values)
+                and all(isinstance(v, np.ndarray) and v.shape == values[0].shape for v in values)):
+            # A sequence of equally sized arrays is stored as one contiguous array,
+            # so that the per-coefficient arithmetic vectorizes over the rows.
+            values = np.ascontiguousarray(values)
+
+        # Keys that came straight from the algebra's grade cache need no validation.
+        if keys is not algebra.indices_for_grades(grades) and not all(_bit_count(k) in grades for k in keys):
             raise ValueError(f"All keys should be of grades {grades}.")
 
         return cls.fromkeysvalues(algebra, keys, values)
 
     @classmethod
-    def fromkeysvalues(cls, algebra, keys, values):
+    def fromkeysvalues(cls, algebra, keys, values, issymbolic=None):
         """
         Initiate a multivector from a sequence of keys and a sequence of values.
+
+        :param issymbolic: Callers that already know whether the values are symbolic
+            (e.g. the operator dicts) can pass it along, which saves the values scan
+            that :attr:`issymbolic` performs on first access.
         """
         obj = object.__new__(cls)
         obj.algebra = algebra
         obj._values = values
         obj._keys = keys
+        if issymbolic is not None:
+            # Pre-seed the cached_property.
+            obj.issymbolic = issymbolic
         return obj
 
     @classmethod
@@ -149,6 +154,11 @@ class MultiVector:
     def __len__(self):
         return len(self._values)
 
+    @cached_property
+    def _key2idx(self) -> dict:
+        """ Mapping from the keys of this multivector to their slot in the values. """
+        return {k: i for i, k in enumerate(self._keys)}
+
     @cached_property
     def type_number(self) -> int:
         return int(''.join('1' if i in self.keys() else '0' for i in reversed(self.algebra.canon2bin.values())), 2)
@@ -185,7 +195,7 @@ class MultiVector:
     @cached_property
     def grades(self):
         """ Tuple of the grades present in `self`. """
-        return tuple(sorted({bin(ind).count('1') for ind in self.keys()}))
+        return tuple(sorted({_bit_count(ind) for ind in self.keys()}))
 
     def grade(self, *grades):
         """
@@ -249,12 +259,45 @@ class MultiVector:
         """ Inverse of this multivector. """
         return self.algebra.inv(self)
 
+    def _is_numeric_pair(self, other):
+        """ True if `self` and `other` are numeric array-valued mvs of the same algebra. """
+        return (isinstance(other, MultiVector) and other.algebra is self.algebra
+                and isinstance(self._values, np.ndarray) and self._values.dtype != object
+                and isinstance(other._values, np.ndarray) and other._values.dtype != object
+                and self._values.shape[1:] == other._values.shape[1:])
+
+    def _numeric_addsub(self, other, subtract=False):
+        """ Vectorized add/sub for numeric array-valued multivectors; skips codegen. """
+        algebra = self.algebra
+        sv, ov = self._values, other._values
+        # Results are returned as lists of coefficients, like the generated functions do.
+        if self._keys == other._keys:
+            return self.fromkeysvalues(algebra, self._keys, list(sv - ov if subtract else sv + ov), issymbolic=False)
+        # Scatter both operands into the union of their keys, in canonical order.
+        positions = algebra._key_positions
+        pos_s = np.fromiter((positions[k] for k in self._keys), dtype=np.intp, count=len(self._keys))
+        pos_o = np.fromiter((positions[k] for k in other._keys), dtype=np.intp, count=len(other._keys))
+        union = np.union1d(pos_s, pos_o)
+        out = np.zeros((len(union), *sv.shape[1:]), dtype=np.result_type(sv, ov))
+        out[np.searchsorted(union, pos_s)] = sv
+        idx_o = np.searchsorted(union, pos_o)
+        if subtract:
+            out[idx_o] -= ov
+        else:
+            out[idx_o] += ov
+        keys_out = tuple(algebra._canonical_keys[p] for p in union)
+        return self.fromkeysvalues(algebra, keys_out, list(out), issymbolic=False)
+
     def add(self, other):
+        if self._is_numeric_pair(other):
+            return self._numeric_addsub(other)
         return self.algebra.add(self, other)
 
     __radd__ = __add__ = add
 
     def sub(self, other):
+        if self._is_numeric_pair(other):
+            return self._numeric_addsub(other, subtract=True)
         return self.algebra.sub(self, other)
 
     __sub__ = sub
@@ -346,9 +389,7 @@ class MultiVector:
         basis_blade, swaps = self.algebra._blade2canon(basis_blade)
         if basis_blade not in self.algebra.canon2bin:
             return 0
-        try:
-            idx = self.keys().index(self.algebra.canon2bin[basis_blade])
-        except ValueError:
+        if (idx := self._key2idx.get(self.algebra.canon2bin[basis_blade])) is None:
             return 0
         return self._values[idx] if swaps % 2 == 0 else - self._values[idx]
 
@@ -367,9 +408,11 @@ class MultiVector:
 
     def __contains__(self, item):
         item = item if isinstance(item, int) else self.algebra.canon2bin[item]
-        return item in self._keys
+        return item in self._key2idx
 
     def __bool__(self):
+        if isinstance(self._values, np.ndarray):
+            return bool(self._values.any())
         return bool(self.values())
 
     @cached_property
@@ -445,6 +488,22 @@ class MultiVector:
         return self.fromkeysvalues(self.algebra, keys=keys, values=values)
 
     def gp(self, other):
+        algebra = self.algebra
+        if (algebra.dense_gp
+                and isinstance(other, MultiVector) and other.algebra is algebra
+                and isinstance(self._values, np.ndarray) and self._values.dtype != object
+                and isinstance(other._values, np.ndarray) and other._values.dtype != object
+                and len(self._keys) == len(algebra) and len(other._keys) == len(algebra)
+                and (cayley := algebra.cayley_tensor) is not None):
+            # Fully dense numeric product: contract with the Cayley tensor directly
+            # instead of going through (potentially very expensive) codegen.
+            a = np.zeros((len(algebra), *self._values.shape[1:]), dtype=self._values.dtype)
+            a[np.fromiter(self._keys, dtype=np.intp, count=len(self._keys))] = self._values
+            b = np.zeros((len(algebra), *other._values.shape[1:]), dtype=other._values.dtype)
+            b[np.fromiter(other._keys, dtype=np.intp, count=len(other._keys))] = other._values
+            res = np.einsum('ijk,i...,j...->k...', cayley, a, b)
+            keys_out = algebra._canonical_keys
+            return self.fromkeysvalues(algebra, keys_out, list(res[np.fromiter(keys_out, dtype=np.intp, count=len(keys_out))]))
         return self.algebra.gp(self, other)
 
     __mul__ = gp
@@ -1,14 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from collections.abc import Mapping
 from typing import Callable, Tuple
 from functools import wraps
+import hashlib
+import importlib.util
 import inspect
+import os
+import pickle
 import string
+import sys
 
 from sympy import Symbol, Expr, simplify
 
 from kingdon.multivector import MultiVector
-from kingdon.codegen import do_codegen, do_compile
+from kingdon.codegen import do_codegen, do_compile, func_source
 from kingdon.taperecorder import TapeRecorder
 from kingdon.polynomial import RationalPolynomial
 
@@ -17,6 +24,32 @@ class AlgebraError(Exception):
     pass
 
 
+# Simplifying coefficients is CPU-bound pure python, so it pays to fan it out over
+# worker processes. Below this many coefficients the pickling overhead dominates.
+_POOL_THRESHOLD = 8
+_pool = None
+
+
+def _simplify_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor()
+    return _pool
+
+
+def _import_genfile(path: str):
+    """ Import a generated code file, as written by :code:`OperatorDict._cache_store`. """
+    spec = importlib.util.spec_from_file_location(os.path.basename(path)[:-3], path)
+    if spec is None:
+        raise OSError(f'Cannot import generated code from {path}.')
+    module = importlib.util.module_from_spec(spec)
+    # Register the module so it stays importable by name; wrappers like
+    # numba.njit(cache=True) import the defining module when loading their cache.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
 def resolve_and_expand(func):
     """
     Decorator which makes :code:`func` compatible function over MVs compatible with the broader ganja.js style
@@ -124,14 +157,65 @@ class OperatorDict(Mapping):
 
     def __getitem__(self, keys_in: Tuple[Tuple[int]]):
         if keys_in not in self.operator_dict:
-            # Make symbolic multivectors for each set of keys and generate the code.
-            mvs = [MultiVector.fromkeysvalues(self.algebra, keys, list(self.codegen_symbolcls(f'{name}{self.algebra.bin2canon[k][1:]}') for k in keys))
-                   for name, keys in zip(string.ascii_lowercase, keys_in)]
-            keys_out, func = do_codegen(self.codegen, *mvs)
+            if (cached := self._cache_load(keys_in)) is not None:
+                keys_out, func = cached
+            else:
+                # Make symbolic multivectors for each set of keys and generate the code.
+                mvs = [MultiVector.fromkeysvalues(self.algebra, keys, list(self.codegen_symbolcls(f'{name}{self.algebra.bin2canon[k][1:]}') for k in keys))
+                       for name, keys in zip(string.ascii_lowercase, keys_in)]
+                keys_out, func = do_codegen(self.codegen, *mvs)
+                # Prefer the file-backed version of the function, if available.
+                func = self._cache_store(keys_in, keys_out, func) or func
             self.algebra.numspace[func.__name__] = self.algebra.wrapper(func) if self.algebra.wrapper else func
             self.operator_dict[keys_in] = (keys_out, func)
         return self.operator_dict[keys_in]
 
+    def _cache_path(self, keys_in: Tuple[Tuple[int]]) -> str:
+        """ Filename in :code:`algebra.codegen_cache_dir` for the given input keys. """
+        symbolcls = self.codegen_symbolcls
+        symbolcls = symbolcls.__self__ if hasattr(symbolcls, '__self__') else symbolcls
+        fingerprint = repr((
+            tuple(self.algebra.signature.tolist()),
+            tuple(self.algebra.canon2bin),
+            self.name,
+            keys_in,
+            self.algebra.cse,
+            getattr(symbolcls, '__qualname__', repr(symbolcls)),
+        ))
+        digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+        return os.path.join(self.algebra.codegen_cache_dir, f'{self.name}_{digest}.py')
+
+    def _cache_load(self, keys_in: Tuple[Tuple[int]]):
+        """ Attempt to load previously generated code from disk, skipping codegen entirely. """
+        if not self.algebra.codegen_cache_dir:
+            return None
+        try:
+            module = _import_genfile(self._cache_path(keys_in))
+            return module.keys_out, getattr(module, module.funcname)
+        except (OSError, SyntaxError, AttributeError):
+            # Unreadable or malformed cache entries are no reason to fail; just regenerate.
+            return None
+
+    def _cache_store(self, keys_in: Tuple[Tuple[int]], keys_out: Tuple[int], func: Callable):
+        """
+        Persist the source of a generated function to :code:`algebra.codegen_cache_dir`
+        as an importable python file, and return the function re-imported from that file.
+        Functions loaded from a real file (unlike exec'd sources) can be cached on disk
+        by wrappers such as :code:`numba.njit(cache=True)`.
+        """
+        if not self.algebra.codegen_cache_dir:
+            return None
+        if not (source := func_source(func)):
+            return None
+        os.makedirs(self.algebra.codegen_cache_dir, exist_ok=True)
+        path = self._cache_path(keys_in)
+        with open(path, 'w') as f:
+            f.write(f'keys_out = {tuple(keys_out)!r}\nfuncname = {func.__name__!r}\n\n{source}')
+        try:
+            return getattr(_import_genfile(path), func.__name__)
+        except (OSError, SyntaxError, AttributeError):
+            return None
+
     def __contains__(self, keys_in: Tuple[Tuple[int]]):
         return keys_in in self.operator_dict
 
@@ -140,7 +224,24 @@ class OperatorDict(Mapping):
 
     def filter(self, keys_out, values_out):
         """ For given keys and values, keep only symbolically non-zero elements. """
-        keysvalues = tuple((k, simpv) for k, v in zip(keys_out, values_out) if (simpv := self.algebra.simp_func(v)))
+        simp_func = self.algebra.simp_func
+        # Only sympy expressions are actually simplified by the default simp_func;
+        # for other symbol classes the pool would pickle every value for nothing.
+        if len(values_out) >= _POOL_THRESHOLD and any(isinstance(v, Expr) for v in values_out):
+            try:
+                # Each coefficient is independent, so simplify them on separate cores.
+                values_out = list(_simplify_pool().map(simp_func, values_out))
+            except BrokenProcessPool:
+                # The pool died on us; replace it next time around, and simplify serially for now.
+                global _pool
+                _pool = None
+                values_out = [simp_func(v) for v in values_out]
+            except (pickle.PicklingError, AttributeError, TypeError):
+                # simp_func (or a value) that cannot be pickled is simplified serially after all.
+                values_out = [simp_func(v) for v in values_out]
+            keysvalues = tuple((k, v) for k, v in zip(keys_out, values_out) if v)
+        else:
+            keysvalues = tuple((k, simpv) for k, v in zip(keys_out, values_out) if (simpv := simp_func(v)))
         keys, values = zip(*keysvalues) if keysvalues else (tuple(), list())
         return keys, list(values)
 
@@ -167,7 +268,7 @@ class OperatorDict(Mapping):
         if issymbolic and self.algebra.simp_func:
             keys_out, values_out = self.filter(keys_out, values_out)
 
-        return MultiVector.fromkeysvalues(self.algebra, keys=keys_out, values=values_out)
+        return MultiVector.fromkeysvalues(self.algebra, keys=keys_out, values=values_out, issymbolic=issymbolic)
 
     def _call_binary(self, mv1, mv2):
         """ Specialization for binary operators. """
@@ -188,7 +289,7 @@ class OperatorDict(Mapping):
         if issymbolic and self.algebra.simp_func:
             keys_out, values_out = self.filter(keys_out, values_out)
 
-        return MultiVector.fromkeysvalues(self.algebra, keys=keys_out, values=values_out)
+        return MultiVector.fromkeysvalues(self.algebra, keys=keys_out, values=values_out, issymbolic=issymbolic)
 
 
 class UnaryOperatorDict(OperatorDict):
@@ -199,8 +300,12 @@ class UnaryOperatorDict(OperatorDict):
     """
     def __getitem__(self, keys_in: Tuple[Tuple[int]]):
         if keys_in not in self.operator_dict:
-            mv = MultiVector.fromkeysvalues(self.algebra, keys_in, list(self.codegen_symbolcls(f'a{self.algebra.bin2canon[k][1:]}') for k in keys_in))
-            keys_out, func = do_codegen(self.codegen, mv)
+            if (cached := self._cache_load(keys_in)) is not None:
+                keys_out, func = cached
+            else:
+                mv = MultiVector.fromkeysvalues(self.algebra, keys_in, list(self.codegen_symbolcls(f'a{self.algebra.bin2canon[k][1:]}') for k in keys_in))
+                keys_out, func = do_codegen(self.codegen, mv)
+                func = self._cache_store(keys_in, keys_out, func) or func
             self.algebra.numspace[func.__name__] = self.algebra.wrapper(func) if self.algebra.wrapper else func
             self.operator_dict[keys_in] = (keys_out, func)
         return self.operator_dict[keys_in]
@@ -218,7 +323,7 @@ class UnaryOperatorDict(OperatorDict):
         if issymbolic and self.algebra.simp_func:
             keys_out, values_out = self.filter(keys_out, values_out)
 
-        return MultiVector.fromkeysvalues(self.algebra, keys=keys_out, values=values_out)
+        return MultiVector.fromkeysvalues(self.algebra, keys=keys_out, values=values_out, issymbolic=issymbolic)
 
 
 class Registry(OperatorDict):
@@ -12,6 +12,9 @@ if __name__ == "__main__":
     num_iter = 1000
     num_rows = 1
     d = 3
+    # For array-valued multivectors (num_rows > 1) a parallel jit pays off,
+    # since the rows can be spread over multiple threads.
+    parallel = num_rows > 1
     cliff = False
     king = True
     king_profile = False
@@ -49,7 +52,7 @@ if __name__ == "__main__":
             print(operation)
             for cse, numba in product([False, True], repeat=2):
                 if numba:
-                    alg = Algebra(d, wrapper=njit, cse=cse)
+                    alg = Algebra(d, wrapper=njit(parallel=True) if parallel else njit, cse=cse)
                 else:
                     alg = Algebra(d, cse=cse)
                 bvals = np.random.random(shape_b)
@@ -1087,3 +1087,48 @@ def test_87(pga2d):
     diff2 = (one + u) - expectedmv
     assert all(diff1.map(lambda v: np.allclose(v, 0.0)).values())
     assert all(diff2.map(lambda v: np.allclose(v, 0.0)).values())
+
+
+def test_dense_gp():
+    alg = Algebra(3, 0, 1, dense_gp=True)
+    ref = Algebra(3, 0, 1)
+    avals = np.random.random(len(alg))
+    bvals = np.random.random(len(alg))
+    dense = alg.multivector(avals) * alg.multivector(bvals)
+    sparse = ref.multivector(avals) * ref.multivector(bvals)
+    assert dense.keys() == sparse.keys()
+    assert np.allclose(np.asarray(dense.values(), dtype=float), np.asarray(sparse.values(), dtype=float))
+    # No codegen should have happened for the dense product.
+    assert (tuple(alg.canon2bin.values()), tuple(alg.canon2bin.values())) not in alg.gp
+    # Sparse (non-full) multivectors still take the codegen path.
+    u = alg.vector(np.random.random(4))
+    v = alg.vector(np.random.random(4))
+    uref = ref.vector(u.values())
+    vref = ref.vector(v.values())
+    assert np.allclose(np.asarray((u * v).values(), dtype=float), np.asarray((uref * vref).values(), dtype=float))
+
+
+def test_large_dimension_not_large():
+    # large=False is a documented override for d > 6; the sign dict is still
+    # lazily populated there, so the dense sign table must not be used.
+    alg = Algebra(7, large=False)
+    assert alg.signs_arr is None
+    u = alg.vector([1.0] * 7)
+    v = alg.vector([2.0] * 7)
+    assert (u * v).e == 14.0
+    # The Cayley tensor cannot be filled from the lazy sign dict either.
+    alg_dense = Algebra(7, large=False, dense_gp=True)
+    assert alg_dense.cayley_tensor is None
+    u = alg_dense.vector(np.array([1.0] * 7))
+    v = alg_dense.vector(np.array([2.0] * 7))
+    assert (u * v).e == 14.0
+
+
+def test_inv_null_blade():
+    alg = Algebra(3, 0, 1)
+    # Null blades have no inverse; the closed-form paths return 0 for them.
+    assert not (1 * alg.blades.e0).inv()
+    assert not alg.pss.inv()
+    # Division by a null blade is an error.
+    with pytest.raises(ZeroDivisionError):
+        alg.blades.e1 / alg.blades.e0